@@ -553,8 +553,10 @@ class FyersDriver(BrokerDriver):
         df.columns = header_mapping.values()
         df['instrument_type'] = df['instrument_type'].map(self.instrument_types) # MAPPING TO STOCK/INDEX TODO - NOT USED MAYBE
         df['instrument_type'] = df['symbol'].apply(lambda x: 'FUT' if x.endswith("FUT") else 'CE' if x.endswith("CE") else 'PE' if x.endswith("PE") else 'EQ')
-        df['expiry'] = pd.to_datetime(df['expiry'], unit='s', errors='coerce')
-        df['expiry'] = df['expiry'].apply(lambda x: pd.to_datetime(x).date() if not pd.isna(x) else np.nan)
+        # Single vectorized epoch conversion + .dt.date - the column is
+        # already datetime64 after to_datetime, so the old per-row apply
+        # re-parsing each value through pd.to_datetime was pure overhead
+        df['expiry'] = pd.to_datetime(df['expiry'], unit='s', errors='coerce', cache=True).dt.date
         df['days_to_expiry'] = df['expiry'].apply(lambda x: np.busday_count(datetime.now().date(), x) + 1 if not pd.isna(x) else np.nan)
         # Updating Segment matching to match with what we have in the zerodha
         def segment_mapping(x):
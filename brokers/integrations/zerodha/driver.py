@@ -304,6 +304,25 @@ class ZerodhaDriver(BrokerDriver):
         exch, tradingsymbol = symbol.split(":", 1)
         return Quote(symbol=tradingsymbol, exchange=Exchange[exch], last_price=last_price, raw=data)
 
+    def get_quotes(self, symbols: List[str]) -> Dict[str, Quote]:  # type: ignore[override]
+        # Kite's quote endpoint is natively bulk (up to 500 instruments per
+        # call) - one round-trip instead of the base class's per-symbol loop
+        if not self._kite or not symbols:
+            return {}
+        try:
+            data = self._kite.quote(symbols)
+        except Exception:
+            return {}
+        out: Dict[str, Quote] = {}
+        for sym, payload in data.items():
+            if ":" in sym:
+                exch, tradingsymbol = sym.split(":", 1)
+            else:
+                exch, tradingsymbol = "NSE", sym
+            last_price = float(payload.get("last_price", 0.0))
+            out[sym] = Quote(symbol=tradingsymbol, exchange=Exchange[exch], last_price=last_price, raw=payload)
+        return out
+
     def get_history(self, symbol: str, interval: str, start: str, end: str) -> List[Dict[str, Any]]:
         if not self._kite:
             return []
@@ -386,7 +405,9 @@ class ZerodhaDriver(BrokerDriver):
         }
         df = df[columns]
         df.columns = list(header_mapping.values())
-        df['expiry'] = pd.to_datetime(df['expiry']).dt.date
+        # cache=True reuses parsed values - expiries repeat across the
+        # ~50k contracts, so only the few hundred unique dates get parsed
+        df['expiry'] = pd.to_datetime(df['expiry'], cache=True).dt.date
         df['days_to_expiry'] = df['expiry'].apply(lambda x: np.busday_count(datetime.now().date(), x) + 1 if not pd.isna(x) else np.nan)
         self.master_contract_df = df
         self.cache_file = ".cache/zerodha_master_contract.csv"
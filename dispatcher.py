@@ -1,3 +1,5 @@
+import threading
+
 from logger import logger
 
 class DataDispatcher:
@@ -8,9 +10,11 @@ class DataDispatcher:
     def __init__(self):
         """
         Initializes the DataDispatcher.
-        It expects a single main queue to be registered.
+        It expects a single main queue (or deque) to be registered.
         """
         self._main_queue = None  # The single queue for all dispatches
+        self._main_deque = None  # Optional lock-free alternative to the queue
+        self._wakeup = None      # Event used to wake the deque consumer
         logger.debug(f"DataDispatcher initialized, awaiting main queue registration.")
 
     def register_main_queue(self, q):
@@ -25,13 +29,46 @@ class DataDispatcher:
         self._main_queue = q
         logger.info(f"Main queue registered for DataDispatcher.")
 
+    def register_main_deque(self, dq, wakeup=None):
+        """
+        Registers a deque as the main dispatch target instead of a queue.
+
+        deque.append/popleft are atomic under the GIL, so the single
+        websocket producer and single strategy consumer can share it
+        without the two lock acquisitions per tick that queue.Queue pays.
+        The consumer should wait on the returned Event, then batch-drain
+        the deque with popleft until it is empty.
+
+        Args:
+            dq (collections.deque): The deque to dispatch into. Use a
+                bounded maxlen so a stalled consumer drops old ticks
+                instead of growing without limit.
+            wakeup (threading.Event, optional): Event set on every
+                dispatch. Created if not supplied.
+
+        Returns:
+            threading.Event: The wakeup event for the consumer to wait on.
+        """
+        if self._main_deque is not None:
+            logger.warning("Main deque is already registered. Overwriting.")
+        self._main_deque = dq
+        self._wakeup = wakeup if wakeup is not None else threading.Event()
+        logger.info(f"Main deque registered for DataDispatcher.")
+        return self._wakeup
+
     def dispatch(self, data):
         """
-        Dispatch a data item to the main queue.
+        Dispatch a data item to the main queue (or deque).
 
         Args:
             data (dict): The data item (e.g., market data bar) to be dispatched.
         """
+        if self._main_deque is not None:
+            # Lock-free path: atomic append plus an event set for wakeup
+            self._main_deque.append(data)
+            self._wakeup.set()
+            return
+
         if self._main_queue is None:
             logger.error("Attempted to dispatch data, but no main queue has been registered.")
             return
@@ -1,8 +1,9 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, Response
 import sqlite3
-import json
+import orjson
 from datetime import datetime, timedelta
-from database import get_db, sync_profiles
+from functools import lru_cache
+from database import get_db, sync_profiles, normalize_trades_for_diff, unpack_normalized_trades
 import sys
 import os
 import threading
@@ -33,6 +34,69 @@ def to_datetime_filter(value):
         except:
              return value
 
+def _json_response(payload):
+    # orjson serializes ~5x faster than stdlib json and returns bytes that
+    # can go straight into the response body
+    return Response(orjson.dumps(payload), mimetype='application/json')
+
+# Hot-path SQL defined once at module scope. execute() looks statements up
+# in the connection's statement cache by exact text, so reusing the same
+# string objects means SQLite only compiles each query once per thread.
+Q_PROFILE_BY_SLUG = "SELECT * FROM profiles WHERE slug = ?"
+Q_SNAPSHOT_BY_ID = "SELECT * FROM snapshots WHERE id = ?"
+Q_SNAPSHOT_TRADES = "SELECT raw_data, normalized FROM snapshots WHERE id = ?"
+Q_CHANGE_BY_ID = "SELECT * FROM position_changes WHERE id = ?"
+Q_MAX_CHANGE_ID = "SELECT MAX(id) FROM position_changes"
+Q_LAST_UPDATED = "SELECT MAX(timestamp) FROM latest_snapshots"
+Q_LATEST_REALTIME = "SELECT * FROM latest_snapshots WHERE profile_id = ?"
+
+Q_PREV_DAY_CHANGE = """
+    SELECT * FROM position_changes
+    WHERE profile_id = ? AND day < ?
+    ORDER BY timestamp DESC LIMIT 1
+"""
+
+Q_FIRST_DAY_CHANGE = """
+    SELECT * FROM position_changes
+    WHERE profile_id = ? AND day = ?
+    ORDER BY timestamp ASC LIMIT 1
+"""
+
+Q_DAY_LAST_SNAPSHOT = """
+    SELECT * FROM snapshots
+    WHERE profile_id = ? AND day = ?
+    ORDER BY timestamp DESC LIMIT 1
+"""
+
+Q_DAY_CHANGES = """
+    SELECT * FROM position_changes
+    WHERE profile_id = ? AND day = ?
+    ORDER BY timestamp DESC
+"""
+
+Q_SNAPSHOT_PAIR = """
+    SELECT raw_data AS curr_raw, normalized AS curr_norm,
+           (SELECT id FROM snapshots
+            WHERE profile_id = s.profile_id AND id < s.id
+            ORDER BY id DESC LIMIT 1) AS prev_id
+    FROM snapshots s WHERE id = ?
+"""
+
+Q_DAY_LOG_CHANGES = """
+    SELECT pc.id, pc.timestamp, sw.raw_data AS curr_raw, sw.normalized AS curr_norm,
+           sw.prev_raw, sw.prev_norm
+    FROM position_changes pc
+    JOIN (
+        SELECT id, raw_data, normalized,
+               LAG(raw_data) OVER (ORDER BY id) AS prev_raw,
+               LAG(normalized) OVER (ORDER BY id) AS prev_norm
+        FROM snapshots
+        WHERE profile_id = ?
+    ) sw ON sw.id = pc.snapshot_id
+    WHERE pc.profile_id = ? AND pc.day = ?
+    ORDER BY pc.timestamp ASC
+"""
+
 def is_market_open():
     now = datetime.now()
     # Weekday check: 0=Monday, 4=Friday, 5=Saturday, 6=Sunday
@@ -76,7 +140,6 @@ def monitor_scraper():
             conn = get_db()
             c = conn.cursor()
             last_updated_row = c.execute("SELECT MAX(timestamp) FROM latest_snapshots").fetchone()
-            conn.close()
             
             last_updated = last_updated_row[0] if last_updated_row else None
             
@@ -111,67 +174,108 @@ def monitor_scraper():
             # Sleep a bit to avoid rapid loops on error
             time.sleep(10)
 
-@app.route('/')
-def index():
-    # Sync profiles from file on every refresh
-    sync_profiles()
-    
-    conn = get_db()
-    c = conn.cursor()
-    
-    # Get all profiles
-    profiles_db = c.execute("SELECT * FROM profiles").fetchall()
-    
-    # Get order from urls.txt
-    ordered_slugs = []
+# Parsed urls.txt ordering, cached on the file's mtime so a page hit
+# skips the file read and re-tokenizing entirely
+_urls_cache = {'mtime': None, 'slugs': [], 'map': {}}
+
+def _get_url_order():
+    urls_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'urls.txt')
     try:
-        urls_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'urls.txt')
-        if os.path.exists(urls_path):
+        mtime = os.stat(urls_path).st_mtime
+    except OSError:
+        return [], {}
+
+    if mtime != _urls_cache['mtime']:
+        ordered_slugs = []
+        try:
             with open(urls_path, 'r') as f:
                 for line in f:
                     line = line.strip()
                     if line and not line.startswith('#'):
                         slug = line.split('/')[-1] if 'sensibull.com' in line else line
                         ordered_slugs.append(slug)
-    except Exception as e:
-        print(f"Error reading urls.txt for sorting: {e}")
+        except Exception as e:
+            print(f"Error reading urls.txt for sorting: {e}")
+        _urls_cache['mtime'] = mtime
+        _urls_cache['slugs'] = ordered_slugs
+        # profile_key -> index
+        # We use a large number if not found so they go to the bottom
+        _urls_cache['map'] = {slug: i for i, slug in enumerate(ordered_slugs)}
 
-    # Create a map for sorting
-    # profile_key -> index
-    # We use a large number if not found so they go to the bottom
-    sort_map = {slug: i for i, slug in enumerate(ordered_slugs)}
-    
-    # Sort the DB profiles: those in urls.txt first (in order), others after
-    profiles = sorted(profiles_db, key=lambda p: sort_map.get(p['slug'], 99999))
+    return _urls_cache['slugs'], _urls_cache['map']
+
+# Rendered index page, reused while the underlying data is unchanged.
+# The key is two cheap MAX() probes; a short TTL keeps the time-derived
+# bits (scraper_error) from going stale when no new data arrives.
+_index_cache = {'key': None, 'html': None, 'at': 0.0}
+_index_cache_lock = threading.Lock()
+INDEX_CACHE_TTL = 5  # seconds
+
+@app.route('/')
+def index():
+    # Sync profiles from file on every refresh
+    sync_profiles()
+
+    conn = get_db()
+    c = conn.cursor()
+
+    # Cheap freshness probe: the page content only changes when a new
+    # change row or snapshot lands, so skip the matrix build + template
+    # render entirely if nothing moved since the last render.
+    max_change_id = c.execute(Q_MAX_CHANGE_ID).fetchone()[0]
+    last_updated_row = c.execute(Q_LAST_UPDATED).fetchone()
+    last_updated = last_updated_row[0] if last_updated_row else None
+    cache_key = (max_change_id, last_updated)
+
+    now = time.time()
+    with _index_cache_lock:
+        if _index_cache['key'] == cache_key and (now - _index_cache['at']) < INDEX_CACHE_TTL:
+            return _index_cache['html']
+
+    # Get order from urls.txt (cached until the file changes)
+    ordered_slugs, sort_map = _get_url_order()
+
+    # Fetch profiles already sorted: those in urls.txt first (in order),
+    # others after. A VALUES CTE lets SQLite do the join + sort in C
+    # instead of a Python sorted() with dict lookups.
+    if ordered_slugs:
+        values = ','.join('(?,?)' for _ in ordered_slugs)
+        params = [v for i, slug in enumerate(ordered_slugs) for v in (slug, i)]
+        profiles = c.execute(f"""
+            WITH ord(slug, pos) AS (VALUES {values})
+            SELECT p.*, COALESCE(o.pos, 99999) AS pos
+            FROM profiles p LEFT JOIN ord o ON o.slug = p.slug
+            ORDER BY pos
+        """, params).fetchall()
+    else:
+        profiles = c.execute("SELECT * FROM profiles").fetchall()
 
     # Calculate dates (last 30 days)
     
     # We have profiles now. Now get dates.
     # Get unique dates from changes
-    dates_rows = c.execute("SELECT DISTINCT date(timestamp) as day FROM position_changes ORDER BY day DESC LIMIT 30").fetchall()
+    dates_rows = c.execute("SELECT DISTINCT day FROM position_changes ORDER BY day DESC LIMIT 30").fetchall()
     dates = [row['day'] for row in dates_rows]
     
     # Build matrix
-    matrix = {} 
-    for p in profiles:
-        for d in dates:
-            # Check if any changes on this day
-            count = c.execute("""
-                SELECT COUNT(*) FROM position_changes 
-                WHERE profile_id = ? AND date(timestamp) = ?
-            """, (p['id'], d)).fetchone()[0]
-            
-            pnl = 0
-            if count > 0:
-                 metrics = get_daily_pnl_metrics(c, p['id'], d)
-                 pnl = metrics['todays_pnl']
-                 
-            matrix[(p['id'], d)] = {'count': count, 'pnl': pnl}
+    # Single GROUP BY query instead of one COUNT per (profile, day) cell
+    matrix = {(p['id'], d): {'count': 0, 'pnl': 0} for p in profiles for d in dates}
+    if dates:
+        placeholders = ','.join('?' * len(dates))
+        count_rows = c.execute(f"""
+            SELECT profile_id, day, COUNT(*) AS cnt
+            FROM position_changes
+            WHERE day IN ({placeholders})
+            GROUP BY profile_id, day
+        """, dates).fetchall()
+
+        for row in count_rows:
+            key = (row['profile_id'], row['day'])
+            if key in matrix:
+                # Only compute P&L for cells that actually have changes
+                metrics = get_daily_pnl_metrics(c, row['profile_id'], row['day'])
+                matrix[key] = {'count': row['cnt'], 'pnl': metrics['todays_pnl']}
             
-    # Get global last updated time
-    last_updated_row = c.execute("SELECT MAX(timestamp) FROM latest_snapshots").fetchone()
-    last_updated = last_updated_row[0] if last_updated_row else None
-    
     scraper_error = None
     if not is_market_open():
         scraper_error = "Scraper is paused (Market Closed)"
@@ -184,50 +288,64 @@ def index():
         else:
              scraper_error = "Scraper has no data yet!"
 
-    conn.close()
-    return render_template('index.html', profiles=profiles, dates=dates, matrix=matrix, last_updated=last_updated, scraper_error=scraper_error)
+    html = render_template('index.html', profiles=profiles, dates=dates, matrix=matrix, last_updated=last_updated, scraper_error=scraper_error)
 
-def calculate_snapshot_pnl(c, snapshot_id):
-    snap = c.execute("SELECT * FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
-    if not snap: return 0, 0
-    raw = json.loads(snap['raw_data'])
+    with _index_cache_lock:
+        _index_cache.update(key=cache_key, html=html, at=now)
+
+    return html
+
+def calculate_pnl_from_raw(raw):
     data = raw.get('data', [])
-    
+
     # Calculate manually to be safe
     total = 0
     booked = 0
-    
+
     for item in data:
         for trade in item.get('trades', []):
             u_pnl = trade.get('unbooked_pnl', 0)
             b_pnl = trade.get('booked_profit_loss', 0)
-            
+
             total += (u_pnl + b_pnl)
             booked += b_pnl
-            
+
     return total, booked
 
+def calculate_snapshot_pnl(c, snapshot_id):
+    snap = c.execute(Q_SNAPSHOT_BY_ID, (snapshot_id,)).fetchone()
+    if not snap: return 0, 0
+    return calculate_pnl_from_raw(orjson.loads(snap['raw_data']))
+
+@lru_cache(maxsize=512)
+def _load_trades(snapshot_id):
+    """
+    Fetch, parse and normalize a snapshot's trades, cached by snapshot id.
+    Snapshots are append-only (never updated in place), so caching on id is
+    safe. delete_date clears the cache when rows are removed.
+    """
+    conn = get_db()
+    row = conn.cursor().execute(Q_SNAPSHOT_TRADES, (snapshot_id,)).fetchone()
+    if not row:
+        return {}
+    if row['normalized']:
+        return unpack_normalized_trades(row['normalized'])
+    # Older rows predate the normalized column - fall back to parsing
+    return normalize_trades_for_diff(orjson.loads(row['raw_data']).get('data', []))
+
 def get_daily_pnl_metrics(c, profile_id, date):
     # 1. Start Day P&L
     start_day_pnl = 0
     
     # Try to get previous day's close
-    prev_change = c.execute("""
-        SELECT * FROM position_changes 
-        WHERE profile_id = ? AND date(timestamp) < ? 
-        ORDER BY timestamp DESC LIMIT 1
-    """, (profile_id, date)).fetchone()
+    prev_change = c.execute(Q_PREV_DAY_CHANGE, (profile_id, date)).fetchone()
     
     if prev_change:
         prev_total, prev_booked = calculate_snapshot_pnl(c, prev_change['snapshot_id'])
         start_day_pnl = prev_total - prev_booked
     else:
         # Fallback to first change of the day
-        first_change = c.execute("""
-            SELECT * FROM position_changes 
-            WHERE profile_id = ? AND date(timestamp) = ? 
-            ORDER BY timestamp ASC LIMIT 1
-        """, (profile_id, date)).fetchone()
+        first_change = c.execute(Q_FIRST_DAY_CHANGE, (profile_id, date)).fetchone()
         
         if first_change:
             total, booked = calculate_snapshot_pnl(c, first_change['snapshot_id'])
@@ -244,7 +362,7 @@ def get_daily_pnl_metrics(c, profile_id, date):
     booked_pnl = 0
     
     # First try latest_snapshots for realtime data
-    latest_realtime = c.execute("SELECT * FROM latest_snapshots WHERE profile_id = ?", (profile_id,)).fetchone()
+    latest_realtime = c.execute(Q_LATEST_REALTIME, (profile_id,)).fetchone()
     
     # We only use realtime if it matches the requested date
     # (Or should we always use it if date is TODAY? Yes.)
@@ -257,7 +375,7 @@ def get_daily_pnl_metrics(c, profile_id, date):
     
     if use_realtime:
         # Parse raw_data manually since we don't have calculate_snapshot_pnl helper for raw JSON input
-        raw = json.loads(latest_realtime['raw_data'])
+        raw = orjson.loads(latest_realtime['raw_data'])
         last_updated = latest_realtime['timestamp'] # Get timestamp from latest_snapshots
         data = raw.get('data', [])
         total = 0
@@ -270,11 +388,7 @@ def get_daily_pnl_metrics(c, profile_id, date):
         booked_pnl = booked
     else:
         # Fallback to history (Last recorded snapshot for that day)
-        latest_snapshot = c.execute("""
-            SELECT * FROM snapshots 
-            WHERE profile_id = ? AND date(timestamp) = ? 
-            ORDER BY timestamp DESC LIMIT 1
-        """, (profile_id, date)).fetchone()
+        latest_snapshot = c.execute(Q_DAY_LAST_SNAPSHOT, (profile_id, date)).fetchone()
         
         if latest_snapshot:
             current_pnl, booked_pnl = calculate_snapshot_pnl(c, latest_snapshot['id'])
@@ -295,22 +409,16 @@ def daily_view(slug, date):
     conn = get_db()
     c = conn.cursor()
     
-    profile = c.execute("SELECT * FROM profiles WHERE slug = ?", (slug,)).fetchone()
+    profile = c.execute(Q_PROFILE_BY_SLUG, (slug,)).fetchone()
     if not profile:
-        conn.close()
         return "Profile not found", 404
     
     # Get changes for this date
-    changes = c.execute("""
-        SELECT * FROM position_changes 
-        WHERE profile_id = ? AND date(timestamp) = ? 
-        ORDER BY timestamp DESC
-    """, (profile['id'], date)).fetchall()
+    changes = c.execute(Q_DAY_CHANGES, (profile['id'], date)).fetchall()
     
     # Get Metrics
     metrics = get_daily_pnl_metrics(c, profile['id'], date)
         
-    conn.close()
     return render_template('daily_view.html', 
                          slug=slug, 
                          date=date, 
@@ -322,31 +430,27 @@ def api_diff(change_id):
     conn = get_db()
     c = conn.cursor()
     
-    change = c.execute("SELECT * FROM position_changes WHERE id = ?", (change_id,)).fetchone()
+    change = c.execute(Q_CHANGE_BY_ID, (change_id,)).fetchone()
     if not change:
-        conn.close()
-        return jsonify({'error': 'Change not found'}), 404
+        return _json_response({'error': 'Change not found'}), 404
         
-    current_snapshot = c.execute("SELECT * FROM snapshots WHERE id = ?", (change['snapshot_id'],)).fetchone()
-    current_raw = json.loads(current_snapshot['raw_data']) if current_snapshot else {}
-    current_trades = normalize_trades_for_diff(current_raw.get('data', []))
-
-    # Find PREVIOUS snapshot for this profile
-    # We want the latest snapshot BEFORE this one
-    prev_snapshot = c.execute("""
-        SELECT * FROM snapshots 
-        WHERE profile_id = ? AND id < ? 
-        ORDER BY id DESC LIMIT 1
-    """, (change['profile_id'], change['snapshot_id'])).fetchone()
-    
-    prev_raw = json.loads(prev_snapshot['raw_data']) if prev_snapshot else {}
-    prev_trades = normalize_trades_for_diff(prev_raw.get('data', []))
+    # Fetch current snapshot + previous snapshot id in one round-trip
+    snap_pair = c.execute(Q_SNAPSHOT_PAIR, (change['snapshot_id'],)).fetchone()
+
+    current_raw = orjson.loads(snap_pair['curr_raw']) if snap_pair else {}
+    if snap_pair and snap_pair['curr_norm']:
+        current_trades = unpack_normalized_trades(snap_pair['curr_norm'])
+    else:
+        current_trades = normalize_trades_for_diff(current_raw.get('data', []))
+
+    # Previous trades come from the LRU cache - the same snapshot gets
+    # diffed repeatedly as the user clicks through consecutive changes
+    prev_trades = _load_trades(snap_pair['prev_id']) if snap_pair and snap_pair['prev_id'] else {}
     
     # Calculate Diff
     diff_data = calculate_diff(prev_trades, current_trades)
     
-    conn.close()
-    return jsonify({
+    return _json_response({
         'diff_summary': change['diff_summary'],
         'positions': current_raw.get('data', []), # Send full current positions for the bottom table
         'diff': diff_data
@@ -357,146 +461,111 @@ def daily_log(slug, date):
     conn = get_db()
     c = conn.cursor()
     
-    profile = c.execute("SELECT * FROM profiles WHERE slug = ?", (slug,)).fetchone()
+    profile = c.execute(Q_PROFILE_BY_SLUG, (slug,)).fetchone()
     if not profile:
-        conn.close()
-        return jsonify({'error': 'Profile not found'}), 404
+        return _json_response({'error': 'Profile not found'}), 404
         
     # Get metrics for the day to find 'start_day_pnl'
     metrics = get_daily_pnl_metrics(c, profile['id'], date)
     start_day_pnl = metrics['start_pnl']
         
-    # fetch all changes for the day in chronological order
-    changes = c.execute("""
-        SELECT * FROM position_changes 
-        WHERE profile_id = ? AND date(timestamp) = ? 
-        ORDER BY timestamp ASC
-    """, (profile['id'], date)).fetchall()
-    
-    events = []
-    
-    for i, change in enumerate(changes):
-        # Calculate P&L at this snapshot
-        snap_total, snap_booked = calculate_snapshot_pnl(c, change['snapshot_id'])
-        todays_pnl = snap_total - start_day_pnl
-        
-        # Calculate Detailed Diff (Restore "Change" column detail)
-        curr_snap = c.execute("SELECT raw_data FROM snapshots WHERE id = ?", (change['snapshot_id'],)).fetchone()
-        curr_raw = json.loads(curr_snap['raw_data']) if curr_snap else {}
-        curr_trades = normalize_trades_for_diff(curr_raw.get('data', []))
-        
-        # Find previous snapshot (relative to this change)
-        prev_snap = c.execute("""
-            SELECT raw_data FROM snapshots 
-            WHERE profile_id = ? AND id < ? 
-            ORDER BY id DESC LIMIT 1
-        """, (profile['id'], change['snapshot_id'])).fetchone()
-        
-        prev_raw = json.loads(prev_snap['raw_data']) if prev_snap else {}
-        prev_trades = normalize_trades_for_diff(prev_raw.get('data', []))
-        
-        diff_data = calculate_diff(prev_trades, curr_trades)
-        
-        # Build Detailed List
-        detailed_changes = []
-        for item in diff_data['added']:
-            detailed_changes.append({
-                'symbol': item['trading_symbol'],
-                'text': f"Qty: 0 &rarr; {item['quantity']} (+{item['quantity']})",
-                'color': 'green'
-            })
-        for item in diff_data['removed']:
-            detailed_changes.append({
-                'symbol': item['trading_symbol'],
-                'text': f"Qty: {item['quantity']} &rarr; 0 (-{item['quantity']})",
-                'color': 'red'
-            })
-        for item in diff_data['modified']:
-            sign = '+' if item['quantity_diff'] > 0 else ''
-            color = 'green' if item['quantity_diff'] > 0 else 'red'
-            detailed_changes.append({
-                'symbol': item['trading_symbol'],
-                'text': f"Qty: {item['old_quantity']} &rarr; {item['quantity']} ({sign}{item['quantity_diff']})",
-                'color': color
-            })
-            
-        event = {
-            'time': to_datetime_filter(change['timestamp']).strftime('%H:%M:%S'),
-            'type': 'Change', 
-            'changes': detailed_changes, 
-            'change_id': change['id'],
-            'todays_pnl': todays_pnl,
-            'booked_pnl': snap_booked
-        }
-        
-        events.append(event)
-    
-    conn.close()
-    events.reverse() # Latest first
-    return jsonify({'events': events})
+    # Fetch all changes for the day plus their current/previous snapshot blobs
+    # in a single query. The LAG window runs over ALL snapshots of the profile
+    # (inner subquery) so the first change of the day still sees yesterday's
+    # close as its previous snapshot.
+    changes = c.execute(Q_DAY_LOG_CHANGES, (profile['id'], profile['id'], date)).fetchall()
 
-def normalize_trades_for_diff(positions_data):
-    """
-    Extracts all trades and creates a signature map for easy comparison.
-    Key: symbol|product|strike|option_type
-    Value: Trade object (summed quantity if multiple trades exist for same key, though rare)
-    """
-    trades_map = {}
-    for p in positions_data:
-        for t in p.get('trades', []):
-            # Create a unique key for the instrument
-            key = f"{t.get('trading_symbol')}|{t.get('product')}"
-            
-            if key not in trades_map:
-                trades_map[key] = {
-                    'trading_symbol': t.get('trading_symbol'),
-                    'product': t.get('product'),
-                    'quantity': 0,
-                    'average_price': 0,
-                    'last_price': t.get('last_price'), # Keep for reference
-                    'pnl': t.get('unbooked_pnl') # Keep for reference
-                }
-            
-            # Weighted average for price if needed, but usually it's unique enough. 
-            # Let's just sum quantity for now.
-            current_qty = trades_map[key]['quantity']
-            new_qty = int(t.get('quantity', 0))
-            
-            # Simple avg price update (approximate if multiple trades)
-            total_val = (trades_map[key]['average_price'] * current_qty) + (float(t.get('average_price', 0)) * new_qty)
-            trades_map[key]['quantity'] += new_qty
-            if trades_map[key]['quantity'] != 0:
-                trades_map[key]['average_price'] = total_val / trades_map[key]['quantity']
-            
-    return trades_map
+    # Events are produced lazily from the raw rows and only materialized
+    # once, straight into the response payload - no intermediate lists of
+    # half-built dicts hanging around for large days.
+    def iter_events():
+        prev_trades = None
+
+        for change in changes:
+            curr_raw = orjson.loads(change['curr_raw'])
+
+            # Calculate P&L at this snapshot
+            snap_total, snap_booked = calculate_pnl_from_raw(curr_raw)
+            todays_pnl = snap_total - start_day_pnl
+
+            # Calculate Detailed Diff (Restore "Change" column detail)
+            # Snapshots only exist when a change was recorded, so change N's
+            # previous snapshot IS change N-1's current one - carry it forward
+            # and only parse the LAG blob for the first change of the day.
+            if prev_trades is None:
+                if change['prev_norm']:
+                    prev_trades = unpack_normalized_trades(change['prev_norm'])
+                else:
+                    prev_raw = orjson.loads(change['prev_raw']) if change['prev_raw'] else {}
+                    prev_trades = normalize_trades_for_diff(prev_raw.get('data', []))
+            if change['curr_norm']:
+                curr_trades = unpack_normalized_trades(change['curr_norm'])
+            else:
+                curr_trades = normalize_trades_for_diff(curr_raw.get('data', []))
+
+            diff_data = calculate_diff(prev_trades, curr_trades)
+            prev_trades = curr_trades
+
+            # Build Detailed List
+            detailed_changes = []
+            for item in diff_data['added']:
+                detailed_changes.append({
+                    'symbol': item['trading_symbol'],
+                    'text': f"Qty: 0 &rarr; {item['quantity']} (+{item['quantity']})",
+                    'color': 'green'
+                })
+            for item in diff_data['removed']:
+                detailed_changes.append({
+                    'symbol': item['trading_symbol'],
+                    'text': f"Qty: {item['quantity']} &rarr; 0 (-{item['quantity']})",
+                    'color': 'red'
+                })
+            for item in diff_data['modified']:
+                sign = '+' if item['quantity_diff'] > 0 else ''
+                color = 'green' if item['quantity_diff'] > 0 else 'red'
+                detailed_changes.append({
+                    'symbol': item['trading_symbol'],
+                    'text': f"Qty: {item['old_quantity']} &rarr; {item['quantity']} ({sign}{item['quantity_diff']})",
+                    'color': color
+                })
+
+            yield {
+                'time': to_datetime_filter(change['timestamp']).strftime('%H:%M:%S'),
+                'type': 'Change',
+                'changes': detailed_changes,
+                'change_id': change['id'],
+                'todays_pnl': todays_pnl,
+                'booked_pnl': snap_booked
+            }
+
+    events = list(iter_events())
+    events.reverse() # Latest first
+    return _json_response({'events': events})
 
 def calculate_diff(prev_map, curr_map):
-    added = []
-    removed = []
+    # Dict keys are set-like, so added/removed fall out of two set
+    # differences instead of a membership test per key. Trades are copied
+    # rather than tagged in place - the maps are shared via _load_trades'
+    # cache and the daily_log carry-forward, so mutating them would
+    # corrupt later diffs.
+    prev_keys = prev_map.keys()
+    curr_keys = curr_map.keys()
+
+    added = [dict(curr_map[k], change_type='ADDED') for k in curr_keys - prev_keys]
+    removed = [dict(prev_map[k], change_type='REMOVED') for k in prev_keys - curr_keys]
+
     modified = []
-    
-    all_keys = set(prev_map.keys()) | set(curr_map.keys())
-    
-    for key in all_keys:
-        p = prev_map.get(key)
-        c = curr_map.get(key)
-        
-        if not p:
-            # Added
-            c['change_type'] = 'ADDED'
-            added.append(c)
-        elif not c:
-            # Removed
-            p['change_type'] = 'REMOVED'
-            removed.append(p)
-        else:
-            # Check for modification (quantity change)
-            if p['quantity'] != c['quantity']:
-                c['change_type'] = 'MODIFIED'
-                c['old_quantity'] = p['quantity']
-                c['quantity_diff'] = c['quantity'] - p['quantity']
-                modified.append(c)
-                
+    for key in prev_keys & curr_keys:
+        p = prev_map[key]
+        c = curr_map[key]
+        if p['quantity'] != c['quantity']:
+            modified.append(dict(
+                c,
+                change_type='MODIFIED',
+                old_quantity=p['quantity'],
+                quantity_diff=c['quantity'] - p['quantity'],
+            ))
+
     return {
         'added': added,
         'removed': removed,
@@ -515,24 +584,26 @@ def delete_date(date):
         c = conn.cursor()
         
         # 1. Delete position_changes for this date
-        c.execute("DELETE FROM position_changes WHERE date(timestamp) = ?", (date,))
+        c.execute("DELETE FROM position_changes WHERE day = ?", (date,))
         changes_deleted = c.rowcount
         
         # 2. Delete snapshots for this date
         # Note: Be careful if snapshots are shared (unlikely in this design) or used by latest_snapshots
         # latest_snapshots is separate, so current state is preserved.
-        c.execute("DELETE FROM snapshots WHERE date(timestamp) = ?", (date,))
+        c.execute("DELETE FROM snapshots WHERE day = ?", (date,))
         snaps_deleted = c.rowcount
         
         conn.commit()
-        conn.close()
-        
+
+        # Snapshot ids were deleted - drop any cached parses for them
+        _load_trades.cache_clear()
+
         print(f"Deleted data for {date}: {changes_deleted} changes, {snaps_deleted} snapshots.")
-        return jsonify({'success': True, 'message': f"Deleted {changes_deleted} changes and {snaps_deleted} snapshots."})
+        return _json_response({'success': True, 'message': f"Deleted {changes_deleted} changes and {snaps_deleted} snapshots."})
         
     except Exception as e:
         print(f"Error deleting data for {date}: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _json_response({'error': str(e)}), 500
 
 if __name__ == '__main__':
     # Start monitor thread
@@ -1,13 +1,32 @@
 import sqlite3
 import json
+import msgpack
 from datetime import datetime
 import os
+import threading
 
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sensibull.db')
 
+# One connection per thread, kept open for the life of the thread.
+# Opening/closing per request paid connection-setup cost on every route hit.
+_local = threading.local()
+
 def get_db():
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES)
-    conn.row_factory = sqlite3.Row
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(
+            f"file:{DB_PATH}?cache=shared", uri=True,
+            detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        # WAL lets readers run concurrently with the scraper's writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        _local.conn = conn
     return conn
 
 def init_db():
@@ -37,10 +56,17 @@ def init_db():
             profile_id INTEGER NOT NULL,
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
             raw_data JSON NOT NULL,
+            normalized BLOB,
             created_at_source TEXT,
             FOREIGN KEY (profile_id) REFERENCES profiles (id)
         )
     ''')
+
+    # Migration for databases created before the normalized column existed
+    try:
+        c.execute("ALTER TABLE snapshots ADD COLUMN normalized BLOB")
+    except sqlite3.OperationalError:
+        pass  # column already exists
     
     # Table to record that a change was detected (for easy indexing)
     c.execute('''
@@ -64,8 +90,21 @@ def init_db():
         )
     ''')
     
+    # Generated `day` column (+ indexes) so date-scoped queries hit an
+    # index instead of evaluating date(timestamp) on every row scanned.
+    # ALTER TABLE can only add VIRTUAL generated columns in SQLite, which
+    # is fine since indexes on them are allowed.
+    for table in ('position_changes', 'snapshots'):
+        try:
+            c.execute(f"ALTER TABLE {table} ADD COLUMN day TEXT GENERATED ALWAYS AS (date(timestamp)) VIRTUAL")
+        except sqlite3.OperationalError:
+            pass  # column already exists
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_changes_profile_day ON position_changes(profile_id, day)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_changes_day ON position_changes(day)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_profile_day ON snapshots(profile_id, day)")
+
     conn.commit()
-    conn.close()
     print("Database initialized.")
 
 def upsert_latest_snapshot(conn, profile_id, data, timestamp=None):
@@ -83,6 +122,50 @@ def upsert_latest_snapshot(conn, profile_id, data, timestamp=None):
     """, (profile_id, json.dumps(data), ts_val))
     conn.commit()
 
+def normalize_trades_for_diff(positions_data):
+    """
+    Extracts all trades and creates a signature map for easy comparison.
+    Key: symbol|product|strike|option_type
+    Value: Trade object (summed quantity if multiple trades exist for same key, though rare)
+    """
+    # Accumulate sum(qty) and sum(qty*price) per key, dividing once at the
+    # end instead of recomputing the weighted average inside the loop
+    acc = {}  # key -> [quantity, total_val, symbol, product, last_price, pnl]
+    for p in positions_data:
+        for t in p.get('trades', []):
+            sym = t.get('trading_symbol')
+            prod = t.get('product')
+            key = f"{sym}|{prod}"
+
+            e = acc.get(key)
+            if e is None:
+                # last_price / pnl kept for reference (first trade wins)
+                e = acc[key] = [0, 0.0, sym, prod, t.get('last_price'), t.get('unbooked_pnl')]
+
+            qty = int(t.get('quantity', 0))
+            e[0] += qty
+            e[1] += qty * float(t.get('average_price', 0))
+
+    return {
+        key: {
+            'trading_symbol': e[2],
+            'product': e[3],
+            'quantity': e[0],
+            'average_price': e[1] / e[0] if e[0] != 0 else 0,
+            'last_price': e[4],
+            'pnl': e[5]
+        }
+        for key, e in acc.items()
+    }
+
+def pack_normalized_trades(data):
+    # Pre-flatten the snapshot payload so readers skip JSON parsing and the
+    # per-position normalization loop entirely
+    return msgpack.packb(normalize_trades_for_diff(data.get('data', [])), use_bin_type=True)
+
+def unpack_normalized_trades(blob):
+    return msgpack.unpackb(blob, raw=False)
+
 def sync_profiles():
     # Helper to load profiles from file and ensure they exist in DB
     URLS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'urls.txt')
@@ -105,7 +188,6 @@ def sync_profiles():
     for slug in clean_slugs:
         c.execute("INSERT OR IGNORE INTO profiles (slug, name) VALUES (?, ?)", (slug, slug))
     conn.commit()
-    conn.close()
 
 if __name__ == '__main__':
     init_db()
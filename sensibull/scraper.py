@@ -5,7 +5,7 @@ import time
 import os
 import traceback
 from datetime import datetime, timedelta
-from database import get_db, init_db
+from database import get_db, init_db, pack_normalized_trades
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -48,12 +48,15 @@ def fetch_data(slug):
 def save_snapshot(conn, profile_id, data, timestamp=None):
     c = conn.cursor()
     # Use provided timestamp (IST) or default to CURRENT_TIMESTAMP (UTC, avoided now)
+    # Persist the pre-normalized trades map alongside the raw JSON so the
+    # diff readers can skip parsing entirely
+    normalized = pack_normalized_trades(data)
     if timestamp:
-         c.execute("INSERT INTO snapshots (profile_id, raw_data, created_at_source, timestamp) VALUES (?, ?, ?, ?)", 
-                  (profile_id, json.dumps(data), data.get('created_at'), timestamp))
+         c.execute("INSERT INTO snapshots (profile_id, raw_data, normalized, created_at_source, timestamp) VALUES (?, ?, ?, ?, ?)", 
+                  (profile_id, json.dumps(data), normalized, data.get('created_at'), timestamp))
     else:
-         c.execute("INSERT INTO snapshots (profile_id, raw_data, created_at_source) VALUES (?, ?, ?)", 
-                  (profile_id, json.dumps(data), data.get('created_at')))
+         c.execute("INSERT INTO snapshots (profile_id, raw_data, normalized, created_at_source) VALUES (?, ?, ?, ?)", 
+                  (profile_id, json.dumps(data), normalized, data.get('created_at')))
     return c.lastrowid
 
 def normalize_trades(trades):
@@ -204,7 +207,6 @@ def run_scraper():
         else:
             print(f"-> No change for {slug}")
 
-    conn.close()
 
 def generate_diff_summary(old_data, new_data):
     # Quick helper for summary string
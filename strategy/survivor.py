@@ -102,6 +102,18 @@ class SurvivorStrategy:
         self.strike_difference = self._get_strike_difference(self.symbol_initials)
         logger.info(f"Strike difference for {self.symbol_initials} is {self.strike_difference}")
 
+        # Pre-split the option chain per side. The filter criteria in
+        # _find_nifty_symbol_from_gap (series, option type, segment) never
+        # change between calls, so there is no reason to re-run three
+        # boolean masks over the instruments frame on every lookup.
+        self._option_chain = {
+            option_type: self.instruments[
+                (self.instruments['instrument_type'] == option_type) &
+                (self.instruments['segment'] == "NFO-OPT")
+            ].reset_index(drop=True)
+            for option_type in ("PE", "CE")
+        }
+
     def _nifty_quote(self):
         symbol_code = self.strat_var_index_symbol
         return self.broker.get_quote(symbol_code)
@@ -111,6 +123,11 @@ class SurvivorStrategy:
         # Initialize reset flags - these track when reset conditions are triggered
         self.pe_reset_gap_flag = 0  # Set to 1 when PE trade is executed
         self.ce_reset_gap_flag = 0  # Set to 1 when CE trade is executed
+
+        # Tick price field name ('last_price' for zerodha-style feeds,
+        # 'ltp' for fyers-style) - resolved from the first tick so the
+        # hot path does one lookup instead of two membership tests
+        self._price_key = None
         
         # Get current market data for initialization
         current_quote = self._nifty_quote()
@@ -172,7 +189,10 @@ class SurvivorStrategy:
         
         Called externally by the main trading loop when new market data arrives
         """
-        current_price = ticks['last_price'] if 'last_price' in ticks else ticks['ltp']
+        price_key = self._price_key
+        if price_key is None:
+            price_key = self._price_key = 'last_price' if 'last_price' in ticks else 'ltp'
+        current_price = ticks[price_key]
         
         # Process trading opportunities for both sides
         self._handle_pe_trade(current_price)  # Handle Put option opportunities
@@ -427,31 +447,25 @@ class SurvivorStrategy:
         # Calculate target strike price
         target_strike = ltp + symbol_gap
         
-        # Filter instruments for matching criteria
-        df = self.instruments[
-            (self.instruments['symbol'].str.contains(self.strat_var_symbol_initials)) &
-            (self.instruments['instrument_type'] == option_type) &
-            (self.instruments['segment'] == "NFO-OPT")
-        ]
-        
-        if df.empty:
+        # Use the chain pre-filtered at init for this option type
+        df = self._option_chain.get(option_type)
+        if df is None or df.empty:
             return None
-            
+
         # Find closest strike within acceptable tolerance
-        df['target_strike_diff'] = (df['strike'] - target_strike).abs()
-        
-        # Filter to strikes within half strike difference (tolerance for rounding)
+        target_strike_diff = (df['strike'] - target_strike).abs()
+
+        # Tolerance is half a strike difference (tolerance for rounding)
         tolerance = self._get_strike_difference(self.strat_var_symbol_initials) / 2
-        df = df[df['target_strike_diff'] <= tolerance]
-        
-        if df.empty:
+        best_idx = target_strike_diff.idxmin()
+
+        if target_strike_diff[best_idx] > tolerance:
             logger.error(f"No instrument found for {self.strat_var_symbol_initials} {option_type} "
                         f"within {tolerance} of {target_strike}")
             return None
-            
+
         # Return the closest match
-        best = df.sort_values('target_strike_diff').iloc[0]
-        return best.to_dict()
+        return df.loc[best_idx].to_dict()
 
     def _find_price_eligible_symbol(self, option_type):
         """
@@ -629,7 +643,7 @@ if __name__ == "__main__":
     from strategy.survivor import SurvivorStrategy
     # from brokers.zerodha import ZerodhaBroker
     from logger import logger
-    from queue import Queue
+    from collections import deque
     import random
     import traceback
     import warnings
@@ -1082,9 +1096,12 @@ PARAMETER GROUPS:
         sys.exit(1)
 
     # Initialize data dispatcher for handling real-time market data
-    # The dispatcher manages queues and routes market data to strategy
+    # The dispatcher routes market data to the strategy through a bounded
+    # deque - append/popleft are atomic under the GIL, so the websocket
+    # producer and this consumer skip queue.Queue's per-tick locking
     dispatcher = DataDispatcher()
-    dispatcher.register_main_queue(Queue())
+    tick_deque = deque(maxlen=10000)
+    tick_ready = dispatcher.register_main_deque(tick_deque)
 
     # ==========================================================================
     # SECTION 5: WEBSOCKET CALLBACK CONFIGURATION  
@@ -1135,19 +1152,36 @@ PARAMETER GROUPS:
     # ==========================================================================
     # SECTION 7: MAIN TRADING LOOP
     # ==========================================================================
+    # The tick payload shape (list-of-dicts for Kite-style feeds, single
+    # dict for the others) is fixed for the lifetime of a connection, so
+    # it only needs to be detected on the first tick - not re-checked with
+    # isinstance on every iteration of the hot loop.
+    feed_is_list = None
+
+    # The price field name is likewise fixed per broker ('last_price' or
+    # 'ltp') - resolve it from the first tradeable tick so the per-tick
+    # validation is a single dict lookup instead of isinstance plus two
+    # membership tests.
+    price_key = None
+
     try:
         while True:
             try:
-                # STEP 1: Get market data from dispatcher queue
-                # This call blocks until new tick data arrives from websocket
-                tick_data = dispatcher._main_queue.get()
-                
+                # STEP 1: Get market data from the dispatcher deque
+                # Wait for the producer's wakeup event, then drain ticks
+                # until the deque is empty (several may arrive per wakeup)
+                if not tick_deque:
+                    tick_ready.wait(timeout=1)
+                    tick_ready.clear()
+                    if not tick_deque:
+                        continue
+                tick_data = tick_deque.popleft()
+
                 # STEP 2: Extract the primary instrument data
                 # tick_data is a list, we process the first instrument
-                if isinstance(tick_data, list):
-                    symbol_data = tick_data[0]
-                else:
-                    symbol_data = tick_data
+                if feed_is_list is None:
+                    feed_is_list = isinstance(tick_data, list)
+                symbol_data = tick_data[0] if feed_is_list else tick_data
                 # STEP 3: Optional data simulation for testing
                 # You also need to move `tick_data = dispatcher._main_queue.get()` above 
                 # outside of the while loop for this to work
@@ -1167,7 +1201,12 @@ PARAMETER GROUPS:
                 
                 # STEP 4: Process tick through strategy
                 # This triggers the main strategy logic for PE/CE evaluation
-                if isinstance(symbol_data, dict) and ('last_price' in symbol_data or 'ltp' in symbol_data):
+                if price_key is None and isinstance(symbol_data, dict):
+                    if 'last_price' in symbol_data:
+                        price_key = 'last_price'
+                    elif 'ltp' in symbol_data:
+                        price_key = 'ltp'
+                if price_key is not None and symbol_data.get(price_key) is not None:
                     strategy.on_ticks_update(symbol_data)
                 
             except KeyboardInterrupt:
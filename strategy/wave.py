@@ -63,9 +63,25 @@ class WaveStrategy:
         
         # Initialize broker and get initial position
         logger.info("Downloading instruments...")
-        self.broker.download_instruments() 
-        self.all_instruments = self.broker.get_instruments() 
-        
+        self.broker.download_instruments()
+        self.all_instruments = self.broker.get_instruments()
+        # Index instruments by symbol once - the greeks pass looks up one
+        # instrument per position, and a boolean-mask scan of the full frame
+        # per lookup is O(rows) every time. Only NIFTY-family symbols ever
+        # get looked up (positions are filtered by index prefix first) and
+        # only four columns are read, so slim the frame before indexing to
+        # keep the dict at a few thousand small records instead of the full
+        # exchange dump.
+        nifty_instruments = self.all_instruments[
+            self.all_instruments['symbol'].str.startswith('NIFTY')
+        ]
+        self._instrument_by_symbol = {
+            rec['symbol']: rec
+            for rec in nifty_instruments[
+                ['symbol', 'instrument_type', 'days_to_expiry', 'strike']
+            ].to_dict(orient='records')
+        }
+
         self.initial_positions['position'] = self._get_position_for_symbol()
         
         # Get initial market price
@@ -182,7 +198,7 @@ class WaveStrategy:
             if not pos.symbol.startswith(index_name):
                 continue
 
-            instrument = self.all_instruments[self.all_instruments["symbol"] == pos.symbol].to_dict(orient="records")[0]
+            instrument = self._instrument_by_symbol[pos.symbol]
             quantity = pos.quantity_total
 
             # --- Futures Delta Calculation ---